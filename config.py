@@ -0,0 +1,84 @@
+"""
+Configuration for the Software Engineering Bot.
+This module loads the settings the bot needs from the environment.
+"""
+
+import logging
+import os
+import re
+from dataclasses import dataclass
+
+# Environment variable backing each configuration field
+_ENV_VARS = {
+    "mongo_uri": "MONGO_CONNECTION_STRING",
+    "mongo_db": "MONGO_DATABASE_NAME",
+    "openai_key": "OPENAI_API_KEY",
+    "openai_model": "OPENAI_MODEL"
+}
+
+# Optional environment variables and their defaults
+_OPTIONAL_ENV_VARS = {
+    "log_level": ("SEBOT_LOG", "INFO")
+}
+
+# Fields holding credentials, masked in the repr
+_SECRET_FIELDS = frozenset({"openai_key"})
+
+# User info (user:password@) in a MongoDB connection string
+_URI_CREDENTIALS = re.compile(r"(?<=://)[^@/]+@")
+
+@dataclass(frozen=True)
+class Config:
+    """
+    Immutable settings for the Software Engineering Bot, read once at startup.
+    """
+    
+    __slots__ = tuple(_ENV_VARS) + tuple(_OPTIONAL_ENV_VARS)
+    
+    mongo_uri: str
+    mongo_db: str
+    openai_key: str
+    openai_model: str
+    log_level: str
+    
+    def __repr__(self):
+        """
+        Represent the configuration without exposing credentials.
+        
+        Returns:
+            str: The representation with the API key and connection string password masked.
+        """
+        values = []
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if name in _SECRET_FIELDS:
+                value = "***"
+            elif name == "mongo_uri":
+                value = _URI_CREDENTIALS.sub("***@", value)
+            values.append(f"{name}={value!r}")
+        return f"{type(self).__name__}({', '.join(values)})"
+    
+    @classmethod
+    def from_env(cls):
+        """
+        Load the configuration from environment variables.
+        
+        Returns:
+            Config: The loaded configuration.
+            
+        Raises:
+            RuntimeError: If a required environment variable is not set or a value is invalid.
+        """
+        environ = dict(os.environ)
+        missing = [var for var in _ENV_VARS.values() if not environ.get(var)]
+        if missing:
+            raise RuntimeError(f"Missing required environment variables: {', '.join(missing)}")
+        values = {field: environ[var] for field, var in _ENV_VARS.items()}
+        values.update({
+            field: environ.get(var) or default
+            for field, (var, default) in _OPTIONAL_ENV_VARS.items()
+        })
+        values["log_level"] = values["log_level"].upper()
+        if not isinstance(logging.getLevelName(values["log_level"]), int):
+            raise RuntimeError(f"Invalid log level in SEBOT_LOG: {values['log_level']}")
+        return cls(**values)
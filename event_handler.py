@@ -3,10 +3,95 @@ Event handler for the Software Engineering Bot.
 This module handles events from the OpenAI Assistant API.
 """
 
-import json
-import time
+import inspect
+import logging
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+from cachetools import TTLCache
+import msgspec
 from typing_extensions import override
 from openai import AssistantEventHandler
+import json_utils
+from function_registry import register_functions
+from mongodb_connector import MongoDBConnector
+
+log = logging.getLogger(__name__)
+
+MAX_TOOL_WORKERS = 8  # Upper bound on concurrently executed tool calls
+FLUSH_EVERY_TOKENS = 16  # Flush streamed text to stdout once per this many deltas
+
+# All registered functions are read-only, so their outputs can be shared across turns
+_RESULT_CACHE = TTLCache(maxsize=256, ttl=60)
+_RESULT_CACHE_LOCK = threading.Lock()
+
+# Keyword arguments accepted by the connector method behind each registered function.
+# Keys are interned so lookups against decoded argument names (msgspec field names,
+# which are interned too) can short-circuit on identity.
+_ALLOWED = {
+    func["name"]: frozenset(
+        sys.intern(key)
+        for key in inspect.signature(getattr(MongoDBConnector, func["name"])).parameters
+        if key != "self"
+    )
+    for func in register_functions()
+}
+
+# Python types for the JSON Schema types used in the registered parameter schemas
+_SCHEMA_TYPES = {
+    "string": str,
+    "integer": int,
+    "number": float,
+    "boolean": bool,
+    "object": dict,
+    "array": list
+}
+
+def _schema_type(prop):
+    """
+    Map a JSON Schema property to the Python type msgspec should decode it as.
+    
+    Args:
+        prop (dict): The property schema.
+        
+    Returns:
+        type: The Python type.
+    """
+    if prop["type"] == "array" and "items" in prop:
+        return List[_schema_type(prop["items"])]
+    return _SCHEMA_TYPES[prop["type"]]
+
+def _args_struct(func):
+    """
+    Build a msgspec Struct type describing the arguments of a registered function.
+    Required parameters become required fields; optional ones default to None.
+    
+    Args:
+        func (dict): The registered function definition.
+        
+    Returns:
+        type: The generated Struct type.
+    """
+    parameters = func["parameters"]
+    required = set(parameters.get("required", ()))
+    fields = []
+    for name, prop in parameters["properties"].items():
+        if name in required:
+            fields.append((name, _schema_type(prop)))
+        else:
+            fields.append((name, Optional[_schema_type(prop)], None))
+    return msgspec.defstruct(f"{func['name']}_args", fields, kw_only=True)
+
+# Argument decoders specialized to each registered parameter schema; decoding also
+# validates required fields and types
+_DECODERS = {
+    func["name"]: msgspec.json.Decoder(_args_struct(func))
+    for func in register_functions()
+}
+
+# Result encoder; BSON types without a JSON equivalent are stringified
+_ENCODER = msgspec.json.Encoder(enc_hook=str)
 
 class EventHandler(AssistantEventHandler):
     """
@@ -22,12 +107,14 @@ class EventHandler(AssistantEventHandler):
             mongodb_connector: The MongoDB connector.
         """
         super().__init__()
-        self.response_text = ""
+        self._chunks = []  # Streamed text deltas, joined on demand
         self.tool_outputs = []
         self.run_id = None
-        self.all_tools_done = False  # Track whether all tools are finished
+        self._done = threading.Event()  # Set once all tools are finished
         self.tools_called = False    # Track if any tools are called
         self.connector = mongodb_connector
+        # Map each registered function to its bound connector method
+        self._dispatch = {name: getattr(mongodb_connector, name) for name in _ALLOWED}
         
     @override
     def on_event(self, event):
@@ -50,86 +137,107 @@ class EventHandler(AssistantEventHandler):
         Args:
             data: The data from the event.
         """
-        tool_outputs = []
+        tool_calls = []
         
         for tool_call in data.required_action.submit_tool_outputs.tool_calls:
             func_name = tool_call.function.name
-            args = json.loads(tool_call.function.arguments)
+            arguments = tool_call.function.arguments
             
             # Log the tool call
-            print(f"\n[Tool called: {func_name} with arguments: {args}]", end="")
+            log.info("[Tool called: %s with arguments: %s]", func_name, arguments)
             
-            # Route to the correct function
-            if func_name == "fetch_project_issues":
-                result = self.connector.fetch_project_issues(
-                    project_name=args["project_name"],
-                    status=args.get("status"),
-                    priority=args.get("priority"),
-                    issue_type=args.get("issue_type"),
-                    assignee_id=args.get("assignee_id"),
-                    reporter_id=args.get("reporter_id"),
-                    page=args.get("page", 1),
-                    page_size=args.get("page_size", 50)
-                )
-            elif func_name == "count_issues":
-                result = self.connector.count_issues(
-                    project_name=args["project_name"],
-                    status=args.get("status"),
-                    priority=args.get("priority"),
-                    issue_type=args.get("issue_type"),
-                    assignee_id=args.get("assignee_id"),
-                    reporter_id=args.get("reporter_id")
-                )
-            elif func_name == "list_unique_values":
-                result = self.connector.list_unique_values(
-                    collection_name=args["collection_name"],
-                    attribute_name=args["attribute_name"],
-                    filters=args.get("filters")
-                )
-            elif func_name == "get_project_assignees":
-                result = self.connector.get_project_assignees(
-                    project_name=args["project_name"],
-                    status=args.get("status"),
-                    priority=args.get("priority"),
-                    issue_type=args.get("issue_type"),
-                    reporter_id=args.get("reporter_id")
-                )
-            elif func_name == "get_issue_details":
-                result = self.connector.get_issue_details(args["issue_identifier"])
-            elif func_name == "get_issue_comments":
-                result = self.connector.get_issue_comments(args["issue_id"])
-            elif func_name == "analyze_developer_expertise":
-                result = self.connector.analyze_developer_expertise(
-                    project_name=args["project_name"],
-                    component=args.get("component"),
-                    keywords=args.get("keywords")
-                )
-            else:
-                result = {"error": "Unsupported function call."}
+            tool_calls.append((tool_call.id, func_name, arguments))
+            
+        # Run the tool calls concurrently; outputs keep the original call order
+        try:
+            tool_outputs = []
+            if tool_calls:
+                tool_call_ids, func_names, arguments = zip(*tool_calls)
+                with ThreadPoolExecutor(max_workers=min(MAX_TOOL_WORKERS, len(tool_calls))) as executor:
+                    outputs = list(executor.map(self.run_tool, func_names, arguments))
+                tool_outputs = [
+                    {"tool_call_id": tool_call_id, "output": output}
+                    for tool_call_id, output in zip(tool_call_ids, outputs)
+                ]
                 
-            # Append the result to tool outputs
-            tool_outputs.append({
-                "tool_call_id": tool_call.id,
-                "output": json.dumps(result)
-            })
+            self.tool_outputs = tool_outputs
+        finally:
+            self._done.set()
             
-        self.tool_outputs = tool_outputs
-        self.all_tools_done = True
+    def run_tool(self, func_name, arguments):
+        """
+        Run a single tool call against the MongoDB connector.
+        Successful results are cached for a short time, keyed by function and arguments.
+        
+        Args:
+            func_name (str): The name of the registered function.
+            arguments (str): The JSON-encoded arguments supplied by the Assistant.
+            
+        Returns:
+            str: The JSON-encoded result, or an error object if the call failed.
+        """
+        if func_name not in self._dispatch:
+            return _ENCODER.encode({"error": "Unsupported function call."}).decode()
+            
+        # Decode against the function's schema, rejecting malformed arguments before
+        # touching the database
+        try:
+            args = msgspec.structs.asdict(_DECODERS[func_name].decode(arguments))
+        except msgspec.DecodeError as e:
+            return _ENCODER.encode({"error": f"Invalid arguments for {func_name}: {e}"}).decode()
+            
+        # Omitted optional arguments fall back to the connector's defaults
+        func = self._dispatch[func_name]
+        kwargs = {
+            key: args[key]
+            for key in _ALLOWED[func_name] & args.keys()
+            if args[key] is not None
+        }
+        
+        # Key building, the call and encoding share one guard so a failing call yields
+        # an error output instead of aborting the rest of the batch
+        try:
+            # Serve repeated queries from the cache
+            cache_key = (func_name, json_utils.dumps(kwargs, sort_keys=True))
+            with _RESULT_CACHE_LOCK:
+                output = _RESULT_CACHE.get(cache_key)
+            if output is not None:
+                return output
+                
+            result = func(**kwargs)
+            output = _ENCODER.encode(result).decode()
+        except Exception as e:
+            return _ENCODER.encode({"error": str(e)}).decode()
+            
+        # Only cache successful results so transient failures are retried
+        if not (isinstance(result, dict) and "error" in result):
+            with _RESULT_CACHE_LOCK:
+                _RESULT_CACHE[cache_key] = output
+                
+        return output
         
     def wait_for_tools(self, timeout=5):
         """
         Wait until all tool outputs are handled or timeout.
+        The timeout is measured on the monotonic clock, so wall-clock
+        adjustments cannot cut the wait short or extend it.
         
         Args:
             timeout: The timeout in seconds.
         """
-        start_time = time.time()
-        
-        while not self.all_tools_done:
-            if not self.tools_called or (time.time() - start_time > timeout):
-                break
-            time.sleep(0.1)
+        if self.tools_called:
+            self._done.wait(timeout)
             
+    @property
+    def response_text(self):
+        """
+        The text streamed by the Assistant so far.
+        
+        Returns:
+            str: The concatenated text deltas.
+        """
+        return "".join(self._chunks)
+        
     def on_text_delta(self, delta, snapshot):
         """
         Handle text deltas from the Assistant.
@@ -139,8 +247,11 @@ class EventHandler(AssistantEventHandler):
             snapshot: The current text snapshot.
         """
         if delta.value:
-            print(delta.value, end="", flush=True)
-            self.response_text += delta.value
+            self._chunks.append(delta.value)
+            sys.stdout.write(delta.value)
+            # Flush on the first delta so the response starts immediately, then in batches
+            if len(self._chunks) % FLUSH_EVERY_TOKENS == 1:
+                sys.stdout.flush()
             
     def on_text_done(self, text):
         """
@@ -149,7 +260,7 @@ class EventHandler(AssistantEventHandler):
         Args:
             text: The completed text.
         """
-        print("\n")  # Ensure a blank line between assistant responses
+        print("\n", flush=True)  # Ensure a blank line between assistant responses
         
     def on_exception(self, exception):
         """
@@ -158,4 +269,4 @@ class EventHandler(AssistantEventHandler):
         Args:
             exception: The exception that occurred.
         """
-        print(f"\nException during streaming: {exception}")
\ No newline at end of file
+        log.error("Exception during streaming: %s", exception)
\ No newline at end of file
@@ -0,0 +1,64 @@
+"""
+JSON helpers for the Software Engineering Bot.
+This module wraps orjson for fast (de)serialization and falls back to the
+standard library json module when orjson is not installed.
+"""
+
+from collections.abc import Mapping
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    import json
+
+def _default(obj):
+    """
+    Serialize objects the JSON encoder does not handle natively.
+
+    Args:
+        obj: The object to serialize (e.g. ObjectId, datetime, read-only mappings).
+
+    Returns:
+        The serializable representation of the object.
+    """
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    return str(obj)
+
+def loads(data):
+    """
+    Parse a JSON document.
+
+    Args:
+        data (str | bytes): The JSON document.
+
+    Returns:
+        The parsed object.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumps(obj, indent=False, sort_keys=False):
+    """
+    Serialize an object to a JSON string.
+
+    Args:
+        obj: The object to serialize.
+        indent (bool, optional): Pretty-print the output with two-space indentation.
+        sort_keys (bool, optional): Emit dictionary keys in sorted order.
+
+    Returns:
+        str: The JSON document.
+    """
+    if orjson is not None:
+        option = 0
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=_default, option=option).decode()
+    return json.dumps(obj, default=_default, indent=2 if indent else None, sort_keys=sort_keys)
@@ -3,14 +3,188 @@ Main application file for the Software Engineering Bot.
 This module initializes the bot and starts the conversation loop.
 """
 
+import hashlib
+import logging
 import os
-import json
+import sys
+import threading
 from dotenv import load_dotenv
-from openai import OpenAI
-import pymongo
+from openai import OpenAI, NotFoundError
+from config import Config
 from mongodb_connector import MongoDBConnector
-from function_registry import register_functions
+from function_registry import get_tools
 from event_handler import EventHandler
+import json_utils
+
+log = logging.getLogger(__name__)
+
+# Kept next to this file so the cache is found regardless of the working directory
+ASSISTANT_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".assistant_cache.json")
+KEEPALIVE_INTERVAL = 30  # Seconds between MongoDB keep-alive pings
+BOT_LOGGERS = ("event_handler", __name__)  # Loggers whose level follows SEBOT_LOG
+
+_INSTRUCTIONS_HEADER = """
+You are a chatbot for querying a software project's MongoDB database. Use the provided functions to fetch relevant data based on user input.
+
+The identifier id of issues is in the format of 'ZOOKEEPER-1939' if given without all capitals, capitalize. 
+The status of issues can be 'Open', 'In Progress' or 'Closed'.
+
+You can handle two primary use cases as described in the "Software Engineering Bot" research paper:
+
+1. Issue Statistics Query: Providing statistics about issues in a project, including filtering by status, priority, etc.
+   Example: "How many open issues are there in the Zookeeper project, and what percentage of them are critical?"
+
+2. Developer Assignment Recommendation: Recommending developers for issue assignment based on their expertise and experience.
+   Example: "Who would be the best developer to assign this authentication bug in the security component of the Hadoop project?"
+
+Here is the structure of the database to assist you in crafting accurate responses:
+
+**Collections and Descriptions:**
+- `pull_request_comment`: Comments associated with pull requests, including author and creation details.
+- `mailing_list`: Metadata about mailing lists for projects, such as project ID and name.
+- `travis_build`: Information about Travis CI builds, including build state and duration.
+- `vcs_system`: Version control system details, such as repository type and URL.
+- `pull_request_system`: Details about pull request systems, like the associated project ID and URL.
+- `pull_request_file`: Information about files involved in pull requests, including changes and additions.
+- `issue`: Details about issues, including title, description, priority, and status.
+- `file`: Metadata about files in the version control system.
+- `pull_request_review_comment`: Comments on pull request reviews, including paths and diffs.
+- `project`: Contains project names and IDs.
+- `event`: Events related to issues, including status changes and authors.
+- `refactoring`: Refactoring information, including detection tools and commit details.
+- `commit`: Details about commits, including authors, linked issues, and labels.
+- `tag`: Tags associated with commits in the version control system.
+- `file_action`: Actions performed on files during commits, such as additions and deletions.
+- `issue_system`: Metadata about issue tracking systems, like URLs and project IDs.
+- `commit_changes`: Details about changes between commits, including classifications.
+- `message`: Mailing list messages, including authors, subjects, and bodies.
+- `pull_request_commit`: Commit information related to pull requests.
+- `pull_request_review`: Metadata about pull request reviews, including states and descriptions.
+- `issue_comment`: Comments on issues, including author and creation details.
+- `pull_request`: Metadata about pull requests, such as titles, states, and associated repositories.
+- `pull_request_event`: Events related to pull requests, like commits and changes.
+- `branch`: Metadata about branches in the version control system.
+- `hunk`: Detailed code changes in commits, including line additions and deletions.
+
+Use the above information to guide users in querying the database effectively. Always aim to provide clear and concise answers, and if a query is ambiguous, ask for clarification.
+
+When recommending developers for issue assignment, explain your reasoning based on their experience with similar components, keywords, and past issue resolution.
+"""
+
+def build_instructions(schema):
+    """
+    Build the assistant instructions with the database schema appended.
+    
+    Args:
+        schema (dict): The collection schemas from the MongoDB connector.
+        
+    Returns:
+        str: The assistant instructions.
+    """
+    schema_json = json_utils.dumps(schema, indent=True, sort_keys=True)
+    return "\n".join([_INSTRUCTIONS_HEADER, schema_json])
+
+def get_or_create_assistant(client, instructions, model):
+    """
+    Reuse the assistant recorded in the local cache file, creating it if needed.
+    The cached assistant is updated in place when the instructions, tools or model change.
+    
+    Args:
+        client: The OpenAI client.
+        instructions (str): The assistant instructions.
+        model (str): The model name.
+        
+    Returns:
+        The OpenAI Assistant.
+    """
+    tools = get_tools()
+    instr_hash = hashlib.blake2b(
+        (instructions + json_utils.dumps(tools, sort_keys=True)).encode()
+    ).hexdigest()
+    
+    try:
+        with open(ASSISTANT_CACHE_FILE, encoding="utf-8") as f:
+            cache = json_utils.loads(f.read())
+    except FileNotFoundError:
+        cache = {}
+    except (OSError, ValueError) as e:
+        log.warning("Could not read the assistant cache: %s", e)
+        cache = {}
+        
+    assistant = None
+    assistant_id = cache.get("assistant_id")
+    if assistant_id:
+        try:
+            if cache.get("instr_hash") == instr_hash and cache.get("model") == model:
+                print("Loading OpenAI Assistant...")
+                return client.beta.assistants.retrieve(assistant_id)
+                
+            print("Updating OpenAI Assistant...")
+            assistant = client.beta.assistants.update(
+                assistant_id,
+                instructions=instructions,
+                model=model,
+                tools=tools
+            )
+        except NotFoundError:
+            assistant = None
+            
+    if assistant is None:
+        print("Creating OpenAI Assistant...")
+        assistant = client.beta.assistants.create(
+            name="Software Engineering Bot",
+            instructions=instructions,
+            model=model,
+            tools=tools
+        )
+        
+    try:
+        with open(ASSISTANT_CACHE_FILE, "w", encoding="utf-8") as f:
+            f.write(json_utils.dumps({"assistant_id": assistant.id, "instr_hash": instr_hash, "model": model}))
+    except OSError as e:
+        log.warning("Could not write the assistant cache: %s", e)
+        
+    return assistant
+
+def start_keepalive(db, interval=KEEPALIVE_INTERVAL):
+    """
+    Ping MongoDB periodically on a daemon thread so pooled connections stay warm
+    while the user is typing.
+    
+    Args:
+        db: The MongoDB database object.
+        interval (float, optional): The number of seconds between pings.
+        
+    Returns:
+        threading.Event: Set it to stop the keep-alive thread.
+    """
+    stop = threading.Event()
+    
+    def keepalive():
+        while not stop.wait(interval):
+            try:
+                db.command("ping")
+            except Exception:
+                pass  # The next tool call surfaces connection errors
+                
+    threading.Thread(target=keepalive, name="mongo-keepalive", daemon=True).start()
+    return stop
+
+def read_input(prompt):
+    """
+    Read a line of user input.
+    End of input is treated as a request to exit.
+    
+    Args:
+        prompt (str): The prompt to display.
+        
+    Returns:
+        str: The line entered by the user.
+    """
+    try:
+        return input(prompt)
+    except EOFError:
+        return "exit"
 
 def main():
     """
@@ -19,87 +193,41 @@ def main():
     """
     # Load environment variables
     load_dotenv()
+    config = Config.from_env()
     
-    # MongoDB Connection
-    mongo_connection_string = os.getenv("MONGO_CONNECTION_STRING")
-    mongo_database_name = os.getenv("MONGO_DATABASE_NAME")
+    # Diagnostics share stdout with the streamed answer so they stay in order.
+    # Other libraries (e.g. httpx request lines) only surface warnings.
+    logging.basicConfig(level=logging.WARNING, format="%(message)s", stream=sys.stdout)
+    for name in BOT_LOGGERS:
+        logging.getLogger(name).setLevel(config.log_level)
     
     # Connect to MongoDB
-    print(f"Connecting to MongoDB database: {mongo_database_name}...")
-    mongo_client = pymongo.MongoClient(mongo_connection_string)
-    db = mongo_client[mongo_database_name]
-    
-    # Initialize MongoDB connector
-    connector = MongoDBConnector(db)
+    print(f"Connecting to MongoDB database: {config.mongo_db}...")
+    connector = MongoDBConnector.from_uri(
+        config.mongo_uri,
+        config.mongo_db,
+        appName="se-bot",
+        maxPoolSize=20,
+        minPoolSize=4,
+        serverSelectionTimeoutMS=3000,
+        compressors="zlib",  # zstd/snappy would need extra packages; PyMongo warns when they are missing
+        retryReads=True
+    )
+    # Create the indexes the queries rely on; read-only users fall back to existing ones
+    if not connector.ensure_indexes():
+        print("Could not create MongoDB indexes; using the existing ones.")
+    keepalive = start_keepalive(connector.db)
     
     # Get database schema
     schema = connector.get_collection_schemas()
     
     # OpenAI Client
-    openai_api_key = os.getenv("OPENAI_API_KEY")
-    client = OpenAI(api_key=openai_api_key)
-    
-    # Register functions
-    functions = register_functions()
+    client = OpenAI(api_key=config.openai_key)
     
     # Create assistant with instructions and functions
-    instructions = f"""
-    You are a chatbot for querying a software project's MongoDB database. Use the provided functions to fetch relevant data based on user input.
-    
-    The identifier id of issues is in the format of 'ZOOKEEPER-1939' if given without all capitals, capitalize. 
-    The status of issues can be 'Open', 'In Progress' or 'Closed'.
-    
-    You can handle two primary use cases as described in the "Software Engineering Bot" research paper:
-    
-    1. Issue Statistics Query: Providing statistics about issues in a project, including filtering by status, priority, etc.
-       Example: "How many open issues are there in the Zookeeper project, and what percentage of them are critical?"
-    
-    2. Developer Assignment Recommendation: Recommending developers for issue assignment based on their expertise and experience.
-       Example: "Who would be the best developer to assign this authentication bug in the security component of the Hadoop project?"
+    instructions = build_instructions(schema)
     
-    Here is the structure of the database to assist you in crafting accurate responses:
-    
-    **Collections and Descriptions:**
-    - `pull_request_comment`: Comments associated with pull requests, including author and creation details.
-    - `mailing_list`: Metadata about mailing lists for projects, such as project ID and name.
-    - `travis_build`: Information about Travis CI builds, including build state and duration.
-    - `vcs_system`: Version control system details, such as repository type and URL.
-    - `pull_request_system`: Details about pull request systems, like the associated project ID and URL.
-    - `pull_request_file`: Information about files involved in pull requests, including changes and additions.
-    - `issue`: Details about issues, including title, description, priority, and status.
-    - `file`: Metadata about files in the version control system.
-    - `pull_request_review_comment`: Comments on pull request reviews, including paths and diffs.
-    - `project`: Contains project names and IDs.
-    - `event`: Events related to issues, including status changes and authors.
-    - `refactoring`: Refactoring information, including detection tools and commit details.
-    - `commit`: Details about commits, including authors, linked issues, and labels.
-    - `tag`: Tags associated with commits in the version control system.
-    - `file_action`: Actions performed on files during commits, such as additions and deletions.
-    - `issue_system`: Metadata about issue tracking systems, like URLs and project IDs.
-    - `commit_changes`: Details about changes between commits, including classifications.
-    - `message`: Mailing list messages, including authors, subjects, and bodies.
-    - `pull_request_commit`: Commit information related to pull requests.
-    - `pull_request_review`: Metadata about pull request reviews, including states and descriptions.
-    - `issue_comment`: Comments on issues, including author and creation details.
-    - `pull_request`: Metadata about pull requests, such as titles, states, and associated repositories.
-    - `pull_request_event`: Events related to pull requests, like commits and changes.
-    - `branch`: Metadata about branches in the version control system.
-    - `hunk`: Detailed code changes in commits, including line additions and deletions.
-    
-    Use the above information to guide users in querying the database effectively. Always aim to provide clear and concise answers, and if a query is ambiguous, ask for clarification.
-    
-    When recommending developers for issue assignment, explain your reasoning based on their experience with similar components, keywords, and past issue resolution.
-    
-    {json.dumps(schema, indent=4)}
-    """
-    
-    print("Creating OpenAI Assistant...")
-    assistant = client.beta.assistants.create(
-        name="Software Engineering Bot",
-        instructions=instructions,
-        model=os.getenv("OPENAI_MODEL"),
-        tools=[{"type": "function", "function": func} for func in functions]
-    )
+    assistant = get_or_create_assistant(client, instructions, config.openai_model)
     
     # Create a thread for the conversation
     thread = client.beta.threads.create()
@@ -109,10 +237,11 @@ def main():
     
     # Conversation loop
     while True:
-        user_input = input("\nYou > ")
+        user_input = read_input("\nYou > ")
         
         if user_input.lower() in ["exit", "quit"]:
             print("\nExiting the conversation.")
+            keepalive.set()
             break
         
         # Add user message to the thread
@@ -126,7 +255,7 @@ def main():
         handler = EventHandler(connector)
         
         try:
-            print("\nAssistant > ", end="")  # Print Assistant prefix before starting
+            print("\nAssistant > ", end="", flush=True)  # Print Assistant prefix before starting
             
             # Start the assistant response stream
             with client.beta.threads.runs.stream(
@@ -4,9 +4,72 @@ This module handles all interactions with the MongoDB database.
 """
 
 import pymongo
+from pymongo.errors import OperationFailure
 from bson import ObjectId
-import datetime
-import json
+from bson.errors import InvalidId
+from bson.regex import Regex
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+import json_utils
+
+ISSUE_ASSIGNEE_INDEX = "iss_assignee_status"
+COLLECTION_NAMES_TTL = 60  # Seconds to reuse the list of collection names
+SCHEMAS_TTL = 300  # Seconds to reuse the sampled collection schemas
+ISSUE_SYSTEMS_TTL = 300  # Seconds to reuse a project's issue system IDs
+
+# Server error codes for a result exceeding the 16 MB BSON document limit
+# (BSONObjectTooLarge, and $lookup's "exceeds maximum document size")
+_DOCUMENT_TOO_LARGE_CODES = frozenset({10334, 4568})
+
+# Issue fields that are filtered on by plain equality
+_ISSUE_FILTER_FIELDS = ("status", "priority", "issue_type")
+
+def _maybe_oid(value):
+    """
+    Convert a value to an ObjectId if it is a valid one, parsing it only once.
+    
+    Args:
+        value: The value to convert, typically a hex string.
+        
+    Returns:
+        The ObjectId, or the value unchanged if it is not a valid ObjectId.
+    """
+    if value is None:
+        return value  # ObjectId(None) would generate a new ID
+    try:
+        return ObjectId(value)
+    except (InvalidId, TypeError):
+        return value
+
+def _literal_pattern(text):
+    """
+    Build a case-insensitive BSON regex that matches text literally.
+    
+    Args:
+        text (str): The text to match.
+        
+    Returns:
+        Regex: The BSON regex.
+    """
+    return Regex(re.escape(text), "i")
+
+def _regex_match(field, pattern):
+    """
+    Build an aggregation expression that matches a string field against a regex.
+    Missing and non-string values do not match.
+    
+    Args:
+        field (str): The field path, e.g. "$title".
+        pattern (Regex): The BSON regex; its flags are sent along with it.
+        
+    Returns:
+        dict: The aggregation expression.
+    """
+    return {"$and": [
+        {"$eq": [{"$type": field}, "string"]},
+        {"$regexMatch": {"input": field, "regex": pattern}}
+    ]}
 
 class MongoDBConnector:
     """
@@ -22,27 +85,101 @@ class MongoDBConnector:
             db: The MongoDB database object.
         """
         self.db = db
+        self._issue_system_ids_cache = {}  # Project name -> (fetched at, issue system IDs)
+        self._collection_names_cache = (0.0, None)  # (fetched at, names)
+        self._schemas_cache = (0.0, None)  # (fetched at, schemas)
+        self._has_issue_index = None  # Whether ISSUE_ASSIGNEE_INDEX exists, checked on first use
+
+    @classmethod
+    def from_uri(cls, uri, db_name, maxPoolSize=200, minPoolSize=20, waitQueueTimeoutMS=1000,
+                 **client_options):
+        """
+        Create a connector backed by a new, pre-warmed MongoClient connection pool.
+        Create the connector once and share it: building a new one per request
+        discards the pool and pays the connection and TLS handshakes again.
+        
+        Args:
+            uri (str): The MongoDB connection string.
+            db_name (str): The name of the database.
+            maxPoolSize (int, optional): The maximum number of pooled connections.
+            minPoolSize (int, optional): The number of connections kept open and warmed up.
+            waitQueueTimeoutMS (int, optional): How long to wait for a free connection.
+            **client_options: Additional MongoClient options.
+            
+        Returns:
+            MongoDBConnector: The connector.
+        """
+        client = pymongo.MongoClient(
+            uri,
+            maxPoolSize=maxPoolSize,
+            minPoolSize=minPoolSize,
+            waitQueueTimeoutMS=waitQueueTimeoutMS,
+            **client_options
+        )
+        db = client[db_name]
+        
+        # Ping in parallel so each ping checks out its own connection; this fails
+        # fast if the server is unreachable
+        warm_connections = max(1, min(minPoolSize, maxPoolSize))
+        with ThreadPoolExecutor(max_workers=warm_connections) as executor:
+            for future in [executor.submit(db.command, "ping") for _ in range(warm_connections)]:
+                future.result()
+                
+        return cls(db)
+
+    def ensure_indexes(self):
+        """
+        Create the indexes the connector's queries rely on, if they do not exist yet.
+        This writes to the database, so it is an explicit setup step rather than part
+        of constructing the connector. Building an index on a large collection can
+        take a while the first time.
+        
+        Returns:
+            bool: True if the indexes are in place, False if the user may not create them.
+        """
+        try:
+            self.db["issue"].create_index(
+                [("issue_system_id", 1), ("assignee_id", 1), ("status", 1)],
+                name=ISSUE_ASSIGNEE_INDEX
+            )
+            self.db["issue_comment"].create_index("issue_id")
+            self.db["event"].create_index("issue_id")
+            self.db["commit"].create_index("linked_issue_ids")
+        except OperationFailure:
+            # Typically a read-only user; an index created by someone else is still used
+            self._has_issue_index = None
+            return False
+        self._has_issue_index = True
+        return True
 
     def get_collection_schemas(self):
         """
         Get the schema of each collection in the database.
+        The result is cached for SCHEMAS_TTL seconds.
         
         Returns:
             dict: A dictionary mapping collection names to their schemas.
         """
+        fetched_at, schemas = self._schemas_cache
+        if schemas is not None and time.monotonic() - fetched_at < SCHEMAS_TTL:
+            return schemas
+            
         schemas = {}
-        collections = self.db.list_collection_names()
+        collections = self._get_collection_names()
         for collection in collections:
             sample_doc = self.db[collection].find_one()
             if sample_doc:
                 schemas[collection] = {key: type(value).__name__ for key, value in sample_doc.items()}
             else:
                 schemas[collection] = {}
+        self._schemas_cache = (time.monotonic(), schemas)
         return schemas
 
     def serialize_mongo_doc(self, doc):
         """
         Serialize a MongoDB document to a JSON-serializable format.
+        ObjectIds become strings and datetimes ISO 8601 strings. The conversion runs
+        as a single JSON round-trip in orjson instead of a recursive walk in Python.
         
         Args:
             doc: The document to serialize.
@@ -50,19 +187,25 @@ class MongoDBConnector:
         Returns:
             The serialized document.
         """
-        if isinstance(doc, list):
-            return [self.serialize_mongo_doc(d) for d in doc]
-        elif isinstance(doc, dict):
-            return {key: self.serialize_mongo_doc(value) for key, value in doc.items()}
-        elif isinstance(doc, ObjectId):
-            return str(doc)
-        elif isinstance(doc, datetime.datetime):
-            return doc.isoformat()
-        else:
-            return doc
+        return json_utils.loads(json_utils.dumps(doc))
+
+    def iter_serialized(self, cursor):
+        """
+        Serialize the documents of a cursor one at a time.
+        Only the cursor's current batch is held in memory, rather than the whole result.
+        
+        Args:
+            cursor: The MongoDB cursor.
+            
+        Yields:
+            The serialized documents.
+        """
+        for doc in cursor:
+            yield self.serialize_mongo_doc(doc)
 
     def fetch_project_issues(self, project_name, status=None, priority=None, issue_type=None, 
-                           assignee_id=None, reporter_id=None, page=1, page_size=50):
+                           assignee_id=None, reporter_id=None, page=1, page_size=50, include_total=False,
+                           after_id=None, fields=None):
         """
         Fetch all issues for a specified project with optional filters.
         
@@ -75,50 +218,60 @@ class MongoDBConnector:
             reporter_id (str, optional): Filter issues by reporter ID.
             page (int, optional): The page number for pagination.
             page_size (int, optional): The number of issues per page.
+            include_total (bool, optional): Also count all issues matching the filters.
+                This costs an extra query, so it is off by default.
+            after_id (str, optional): Return the issues after this cursor, taken from the
+                next_cursor of the previous page. Takes precedence over page.
+            fields (list, optional): The issue fields to return. _id is always included.
+                All fields are returned if not given.
             
         Returns:
-            dict: The issues matching the filters.
+            dict: The issues matching the filters, in _id order. total_count is None unless
+                include_total is set; next_cursor is None on the last page.
         """
         try:
-            # Fetch the project by name
-            project = self.db["project"].find_one({"name": project_name})
-            if not project:
-                return {"error": f"Project '{project_name}' not found."}
-
             # Get all issue systems for the project
-            issue_systems = self.db["issue_system"].find({"project_id": project["_id"]})
-            issue_systems_list = list(issue_systems)
-            issue_system_ids = [system["_id"] for system in issue_systems_list]
+            issue_system_ids = self._get_issue_system_ids(project_name)
+            if issue_system_ids is None:
+                return {"error": f"Project '{project_name}' not found."}
             
             # Build the query dynamically
-            query = {"issue_system_id": {"$in": issue_system_ids}}
-            
-            if status:
-                query["status"] = status
-            if priority:
-                query["priority"] = priority
-            if issue_type:
-                query["issue_type"] = issue_type
-            if assignee_id:
-                query["assignee_id"] = ObjectId(assignee_id) if ObjectId.is_valid(assignee_id) else assignee_id
-            if reporter_id:
-                query["reporter_id"] = ObjectId(reporter_id) if ObjectId.is_valid(reporter_id) else reporter_id
+            query = self._build_issue_query(
+                issue_system_ids, status=status, priority=priority, issue_type=issue_type,
+                assignee_id=assignee_id, reporter_id=reporter_id
+            )
 
-            # Skip and limit for pagination
-            skip = (page - 1) * page_size
-            issues = list(self.db["issue"].find(query).skip(skip).limit(page_size))
+            # Count before applying the cursor so the total covers all pages
+            total_count = self.db["issue"].count_documents(query) if include_total else None
+            
+            # Only fetch the requested fields, shrinking both the transfer and serialization
+            projection = {field: 1 for field in fields} if fields else None
+            
+            # Seek past the previous page on the _id index when a cursor is given,
+            # otherwise fall back to skip and limit
+            if after_id:
+                query["_id"] = {"$gt": ObjectId(after_id)}
+                cursor = self.db["issue"].find(query, projection)
+            else:
+                skip = (page - 1) * page_size
+                cursor = self.db["issue"].find(query, projection).skip(skip)
+            # A batch as large as the page fetches it in one round-trip; the server's first
+            # batch is otherwise capped at 101 documents
+            cursor = cursor.sort("_id", 1).limit(page_size).batch_size(page_size)
+            issues = list(self.iter_serialized(cursor))
             
             return {
-                "issues": self.serialize_mongo_doc(issues), 
+                "issues": issues, 
                 "page": page, 
                 "page_size": page_size,
-                "total_count": self.db["issue"].count_documents(query)
+                "total_count": total_count,
+                "next_cursor": issues[-1]["_id"] if len(issues) == page_size else None
             }
         except Exception as e:
             return {"error": str(e)}
     
     def count_issues(self, project_name, status=None, priority=None, issue_type=None, 
-                   assignee_id=None, reporter_id=None):
+                   assignee_id=None, reporter_id=None, approximate=False):
         """
         Count the number of issues in a project based on filters.
         
@@ -129,33 +282,31 @@ class MongoDBConnector:
             issue_type (str, optional): Filter issues by type.
             assignee_id (str, optional): Filter issues by assignee ID.
             reporter_id (str, optional): Filter issues by reporter ID.
+            approximate (bool, optional): Allow an estimate from collection metadata when
+                no filters are given and the project owns every issue system.
             
         Returns:
-            dict: The count of issues matching the filters.
+            dict: The count of issues matching the filters. approximate is True if the
+                count is an estimate.
         """
         try:
-            # Fetch the project by name
-            project = self.db["project"].find_one({"name": project_name})
-            if not project:
+            # Get all issue systems for the project
+            issue_system_ids = self._get_issue_system_ids(project_name)
+            if issue_system_ids is None:
                 return {"error": f"Project '{project_name}' not found."}
 
-            # Get all issue systems for the project
-            issue_systems = self.db["issue_system"].find({"project_id": project["_id"]})
-            issue_system_ids = [system["_id"] for system in issue_systems]
+            # Without filters, a project that owns every issue system owns every issue,
+            # so the collection metadata gives the count without an index traversal
+            filtered = any((status, priority, issue_type, assignee_id, reporter_id))
+            if approximate and not filtered and issue_system_ids and \
+                    len(issue_system_ids) == self.db["issue_system"].estimated_document_count():
+                return {"count": self.db["issue"].estimated_document_count(), "approximate": True}
 
             # Build the query dynamically
-            query = {"issue_system_id": {"$in": issue_system_ids}}
-
-            if status:
-                query["status"] = status
-            if priority:
-                query["priority"] = priority
-            if issue_type:
-                query["issue_type"] = issue_type
-            if assignee_id:
-                query["assignee_id"] = ObjectId(assignee_id) if ObjectId.is_valid(assignee_id) else assignee_id
-            if reporter_id:
-                query["reporter_id"] = ObjectId(reporter_id) if ObjectId.is_valid(reporter_id) else reporter_id
+            query = self._build_issue_query(
+                issue_system_ids, status=status, priority=priority, issue_type=issue_type,
+                assignee_id=assignee_id, reporter_id=reporter_id
+            )
 
             # Count documents matching the query
             count = self.db["issue"].count_documents(query)
@@ -178,7 +329,7 @@ class MongoDBConnector:
         """
         try:
             # Validate collection name
-            if collection_name not in self.db.list_collection_names():
+            if collection_name not in self._get_collection_names():
                 return {"error": f"Collection '{collection_name}' does not exist."}
 
             # Build the query with optional filters
@@ -206,33 +357,19 @@ class MongoDBConnector:
             dict: The assignees matching the filters.
         """
         try:
-            # Fetch the project by name
-            project = self.db["project"].find_one({"name": project_name})
-            if not project:
-                return {"error": f"Project '{project_name}' not found."}
-
             # Get all issue systems for the project
-            issue_systems = self.db["issue_system"].find({"project_id": project["_id"]})
-            issue_systems_list = list(issue_systems)
-            issue_system_ids = [system["_id"] for system in issue_systems_list]
+            issue_system_ids = self._get_issue_system_ids(project_name)
+            if issue_system_ids is None:
+                return {"error": f"Project '{project_name}' not found."}
             
             # Build the query
-            query = {"issue_system_id": {"$in": issue_system_ids}}
-            
-            if status:
-                query["status"] = status
-            if priority:
-                query["priority"] = priority
-            if issue_type:
-                query["issue_type"] = issue_type
-            if reporter_id:
-                query["reporter_id"] = ObjectId(reporter_id) if ObjectId.is_valid(reporter_id) else reporter_id
+            query = self._build_issue_query(
+                issue_system_ids, status=status, priority=priority, issue_type=issue_type,
+                reporter_id=reporter_id
+            )
                 
-            # Fetch issues matching the query
-            issues = list(self.db["issue"].find(query, {"assignee_id": 1}))
-            
-            # Extract unique assignee IDs from the issues
-            assignee_ids = list({issue["assignee_id"] for issue in issues if "assignee_id" in issue})
+            # Let the server deduplicate assignee IDs across the matching issues
+            assignee_ids = self.db["issue"].distinct("assignee_id", query)
             
             return {"assignees": self.serialize_mongo_doc(assignee_ids), "count": len(assignee_ids)}
         except Exception as e:
@@ -249,30 +386,50 @@ class MongoDBConnector:
             dict: The issue details.
         """
         try:
-            # Determine the query based on user input
-            query = {}
-            query["external_id"] = issue_identifier
-            
-            # Retrieve the issue
-            issue = self.db["issue"].find_one(query)
+            # Retrieve the issue and join its comments, events and linked commits in
+            # a single round-trip
+            pipeline = [
+                {"$match": {"external_id": issue_identifier}},
+                {"$limit": 1},
+                {"$lookup": {
+                    "from": "issue_comment",
+                    "localField": "_id",
+                    "foreignField": "issue_id",
+                    "as": "comments"
+                }},
+                {"$lookup": {
+                    "from": "event",
+                    "localField": "_id",
+                    "foreignField": "issue_id",
+                    "as": "events"
+                }},
+                {"$lookup": {
+                    "from": "commit",
+                    "localField": "_id",
+                    "foreignField": "linked_issue_ids",
+                    "as": "linked_commits"
+                }}
+            ]
+            try:
+                issue = next(self.db["issue"].aggregate(pipeline), None)
+            except OperationFailure as e:
+                if e.code not in _DOCUMENT_TOO_LARGE_CODES:
+                    raise
+                # The joined document would exceed the BSON size limit; query separately
+                return self._get_issue_details_separately(issue_identifier)
             if not issue:
                 return {"error": f"Issue matching '{issue_identifier}' not found."}
 
-            # Retrieve related comments
-            comments = list(self.db["issue_comment"].find({"issue_id": issue["_id"]}))
-
-            # Retrieve related events
-            events = list(self.db["event"].find({"issue_id": issue["_id"]}))
-
-            # Retrieve related commits
-            linked_commits = list(self.db["commit"].find({"linked_issue_ids": issue["_id"]}))
-
-            # Serialize data
+            # Serialize the joined document in one pass, then split off the related data
+            issue = self.serialize_mongo_doc(issue)
+            comments = issue.pop("comments")
+            events = issue.pop("events")
+            linked_commits = issue.pop("linked_commits")
             return {
-                "issue": self.serialize_mongo_doc(issue),
-                "comments": self.serialize_mongo_doc(comments),
-                "events": self.serialize_mongo_doc(events),
-                "linked_commits": self.serialize_mongo_doc(linked_commits),
+                "issue": issue,
+                "comments": comments,
+                "events": events,
+                "linked_commits": linked_commits,
             }
         except Exception as e:
             return {"error": str(e)}
@@ -288,11 +445,22 @@ class MongoDBConnector:
             dict: The comments for the issue.
         """
         try:
-            comments = list(self.db["issue_comment"].find({"issue_id": issue_id}))
-            return {"comments": self.serialize_mongo_doc(comments)}
+            return {"comments": list(self.iter_issue_comments(issue_id))}
         except Exception as e:
             return {"error": str(e)}
             
+    def iter_issue_comments(self, issue_id):
+        """
+        Stream the comments of a specified issue.
+        
+        Args:
+            issue_id: The ID of the issue.
+            
+        Yields:
+            dict: The serialized comments.
+        """
+        return self.iter_serialized(self.db["issue_comment"].find({"issue_id": issue_id}))
+            
     def analyze_developer_expertise(self, project_name, component=None, keywords=None):
         """
         Analyze developer expertise to recommend the best assignee for an issue.
@@ -307,113 +475,189 @@ class MongoDBConnector:
             dict: Developer recommendations with expertise scores.
         """
         try:
-            # Get all assignees in the project
-            assignees_result = self.get_project_assignees(project_name=project_name)
-            
-            if "error" in assignees_result:
-                return assignees_result
-                
-            assignees = assignees_result.get("assignees", [])
-            
-            # List to store recommendations
-            recommendations = []
-            
-            for assignee_id in assignees:
-                # Skip if assignee_id is None
-                if not assignee_id:
-                    continue
-                    
-                # Calculate expertise score based on component and keywords
-                expertise_score = 0
-                component_experience = 0
-                keyword_experience = 0
-                resolved_count = 0
-                
-                # Check component experience if specified
-                if component:
-                    # Query issues by assignee and component
-                    # In this simplified version, we use the component as a term to search in issue titles
-                    component_query = {"$and": [
-                        {"issue_system_id": {"$in": self._get_issue_system_ids(project_name)}},
-                        {"assignee_id": assignee_id},
-                        {"$or": [
-                            {"component": {"$regex": component, "$options": "i"}},
-                            {"title": {"$regex": component, "$options": "i"}}
-                        ]}
-                    ]}
-                    
-                    component_experience = self.db["issue"].count_documents(component_query)
-                
-                # Check keyword experience if specified
-                if keywords:
-                    # Query issues by assignee and keywords in title or description
-                    keyword_query = {"$and": [
-                        {"issue_system_id": {"$in": self._get_issue_system_ids(project_name)}},
-                        {"assignee_id": assignee_id},
-                        {"$or": [
-                            {"title": {"$regex": keywords, "$options": "i"}},
-                            {"desc": {"$regex": keywords, "$options": "i"}}
-                        ]}
-                    ]}
-                    
-                    keyword_experience = self.db["issue"].count_documents(keyword_query)
+            issue_system_ids = self._get_issue_system_ids(project_name)
+            if issue_system_ids is None:
+                return {"error": f"Project '{project_name}' not found."}
                 
-                # Get total resolved issues for this assignee
-                resolved_query = {"$and": [
-                    {"issue_system_id": {"$in": self._get_issue_system_ids(project_name)}},
-                    {"assignee_id": assignee_id},
-                    {"status": "Resolved"}
+            # Match issues by component and keywords in the title, component or description.
+            # Without a filter the corresponding experience is always 0.
+            component_match = keyword_match = False
+            if component:
+                component_pattern = _literal_pattern(component)
+                component_match = {"$or": [
+                    _regex_match("$component", component_pattern),
+                    _regex_match("$title", component_pattern)
                 ]}
-                
-                resolved_count = self.db["issue"].count_documents(resolved_query)
-                
-                # Calculate overall expertise score
+            if keywords:
+                keywords_pattern = _literal_pattern(keywords)
+                keyword_match = {"$or": [
+                    _regex_match("$title", keywords_pattern),
+                    _regex_match("$desc", keywords_pattern)
+                ]}
+            
+            # Score every assignee of the project in a single pass over its issues
+            pipeline = [
+                {"$match": {"issue_system_id": {"$in": issue_system_ids}, "assignee_id": {"$ne": None}}},
+                {"$group": {
+                    "_id": "$assignee_id",
+                    "component_experience": {"$sum": {"$cond": [component_match, 1, 0]}},
+                    "keyword_experience": {"$sum": {"$cond": [keyword_match, 1, 0]}},
+                    "resolved_issues": {"$sum": {"$cond": [{"$eq": ["$status", "Resolved"]}, 1, 0]}}
+                }},
                 # Weight component experience more heavily
-                expertise_score = component_experience * 2 + keyword_experience + resolved_count
-                
+                {"$addFields": {"expertise_score": {"$add": [
+                    {"$multiply": ["$component_experience", 2]},
+                    "$keyword_experience",
+                    "$resolved_issues"
+                ]}}},
                 # Only include developers with some expertise
-                if expertise_score > 0:
-                    # Get developer name or use ID if name not available
-                    developer_name = f"Dev-{assignee_id[-4:]}" if isinstance(assignee_id, str) else f"Dev-{str(assignee_id)}"
-                    
-                    recommendations.append({
-                        "developer_id": str(assignee_id),
-                        "developer_name": developer_name,
-                        "expertise_score": expertise_score,
-                        "component_experience": component_experience,
-                        "keyword_experience": keyword_experience,
-                        "resolved_issues": resolved_count
-                    })
-            
-            # Sort recommendations by expertise score (highest first)
-            recommendations.sort(key=lambda x: x["expertise_score"], reverse=True)
-            
-            # Return top 3 recommendations or all if fewer than 3
-            top_recommendations = recommendations[:3] if len(recommendations) >= 3 else recommendations
+                {"$match": {"expertise_score": {"$gt": 0}}},
+                # Keep the top 3 recommendations along with the number of candidates
+                {"$facet": {
+                    "top": [{"$sort": {"expertise_score": -1, "_id": 1}}, {"$limit": 3}],
+                    "total": [{"$count": "count"}]
+                }}
+            ]
+            # Keep the planner on the compound index despite the regex expressions
+            options = {"hint": ISSUE_ASSIGNEE_INDEX} if self._issue_index_exists() else {}
+            result = next(self.db["issue"].aggregate(pipeline, **options), {"top": [], "total": []})
             
+            top_recommendations = []
+            for candidate in self.serialize_mongo_doc(result["top"]):
+                # Stringify the ID once; serialized ObjectIds are already strings
+                assignee_id = candidate["_id"]
+                developer_id = assignee_id if isinstance(assignee_id, str) else str(assignee_id)
+                
+                top_recommendations.append({
+                    "developer_id": developer_id,
+                    "developer_name": f"Dev-{developer_id[-4:]}",
+                    "expertise_score": candidate["expertise_score"],
+                    "component_experience": candidate["component_experience"],
+                    "keyword_experience": candidate["keyword_experience"],
+                    "resolved_issues": candidate["resolved_issues"]
+                })
+                
             return {
                 "recommendations": top_recommendations,
-                "total_candidates": len(recommendations)
+                "total_candidates": result["total"][0]["count"] if result["total"] else 0
             }
             
         except Exception as e:
             return {"error": str(e)}
     
+    def _build_issue_query(self, issue_system_ids, status=None, priority=None, issue_type=None,
+                           assignee_id=None, reporter_id=None):
+        """
+        Helper method to build an issue query from the optional filters.
+        
+        Args:
+            issue_system_ids (list): The issue system IDs of the project.
+            status (str, optional): Filter issues by status.
+            priority (str, optional): Filter issues by priority.
+            issue_type (str, optional): Filter issues by type.
+            assignee_id (str, optional): Filter issues by assignee ID.
+            reporter_id (str, optional): Filter issues by reporter ID.
+            
+        Returns:
+            dict: The MongoDB query.
+        """
+        query = {"issue_system_id": {"$in": issue_system_ids}}
+        query.update(
+            (field, value)
+            for field, value in zip(_ISSUE_FILTER_FIELDS, (status, priority, issue_type))
+            if value
+        )
+        query.update(
+            (field, _maybe_oid(value))
+            for field, value in (("assignee_id", assignee_id), ("reporter_id", reporter_id))
+            if value
+        )
+        return query
+
     def _get_issue_system_ids(self, project_name):
         """
         Helper method to get issue system IDs for a project.
+        Results are cached for ISSUE_SYSTEMS_TTL seconds, since a project's issue
+        systems rarely change.
         
         Args:
             project_name (str): The name of the project.
             
         Returns:
-            list: A list of issue system IDs.
+            list: A list of issue system IDs, or None if the project does not exist.
         """
-        # Fetch the project by name
-        project = self.db["project"].find_one({"name": project_name})
+        fetched_at, issue_system_ids = self._issue_system_ids_cache.get(project_name, (0.0, None))
+        if issue_system_ids is not None and time.monotonic() - fetched_at < ISSUE_SYSTEMS_TTL:
+            return issue_system_ids
+            
+        # Fetch the project by name and join its issue systems in one round-trip
+        pipeline = [
+            {"$match": {"name": project_name}},
+            {"$limit": 1},
+            {"$lookup": {
+                "from": "issue_system",
+                "localField": "_id",
+                "foreignField": "project_id",
+                "as": "issue_systems"
+            }},
+            {"$project": {"_id": 0, "issue_system_ids": "$issue_systems._id"}}
+        ]
+        project = next(self.db["project"].aggregate(pipeline), None)
         if not project:
-            return []
+            return None
+            
+        issue_system_ids = project["issue_system_ids"]
+        self._issue_system_ids_cache[project_name] = (time.monotonic(), issue_system_ids)
+        return issue_system_ids
+
+    def _get_collection_names(self):
+        """
+        Helper method to get the names of the collections in the database.
+        The names are cached for COLLECTION_NAMES_TTL seconds.
+        
+        Returns:
+            frozenset: The collection names.
+        """
+        fetched_at, names = self._collection_names_cache
+        if names is None or time.monotonic() - fetched_at >= COLLECTION_NAMES_TTL:
+            names = frozenset(self.db.list_collection_names())
+            self._collection_names_cache = (time.monotonic(), names)
+        return names
+
+    def _issue_index_exists(self):
+        """
+        Helper method to check whether the issue collection has ISSUE_ASSIGNEE_INDEX.
+        The answer is cached for the lifetime of the connector.
+        
+        Returns:
+            bool: True if the index exists.
+        """
+        if self._has_issue_index is None:
+            try:
+                self._has_issue_index = ISSUE_ASSIGNEE_INDEX in self.db["issue"].index_information()
+            except OperationFailure:
+                self._has_issue_index = False  # Not allowed to list indexes
+        return self._has_issue_index
+
+    def _get_issue_details_separately(self, issue_identifier):
+        """
+        Helper method to retrieve an issue and its related data with separate queries.
+        Used for issues whose joined details exceed the BSON document size limit.
+        
+        Args:
+            issue_identifier (str): The identifier of the issue.
+            
+        Returns:
+            dict: The issue details.
+        """
+        issue = self.db["issue"].find_one({"external_id": issue_identifier})
+        if not issue:
+            return {"error": f"Issue matching '{issue_identifier}' not found."}
             
-        # Get all issue systems for the project
-        issue_systems = self.db["issue_system"].find({"project_id": project["_id"]})
-        return [system["_id"] for system in issue_systems]
\ No newline at end of file
+        issue_id = issue["_id"]
+        return {
+            "issue": self.serialize_mongo_doc(issue),
+            "comments": list(self.iter_serialized(self.db["issue_comment"].find({"issue_id": issue_id}))),
+            "events": list(self.iter_serialized(self.db["event"].find({"issue_id": issue_id}))),
+            "linked_commits": list(self.iter_serialized(self.db["commit"].find({"linked_issue_ids": issue_id}))),
+        }